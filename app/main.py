@@ -1,43 +1,253 @@
-from fastapi import FastAPI, HTTPException
-from fastapi import Request
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from anyio import to_thread
+from pydantic import BaseModel, ConfigDict, FiniteFloat, conlist
 from prometheus_fastapi_instrumentator import Instrumentator
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, multiprocess
 from fastapi.middleware.cors import CORSMiddleware
 import numpy as np
-import pandas as pd
+from numba import njit
+import asyncio
+import math
+import joblib
 import pickle
 import logging
-from typing import List, Optional
+import logging.handlers
+import atexit
+import queue
+from typing import NamedTuple, Optional
 import time
-from datetime import datetime
 import os
 
+# Column order the model was trained on: x1, y1, z1, ..., x21, y21, z21
+FEATURE_NAMES = tuple(f'{axis}{i}' for i in range(1, 22) for axis in ('x', 'y', 'z'))
+
+
+@njit(nogil=True, error_model="numpy")
+def _normalize_rows(features):
+    valid = np.ones(features.shape[0], dtype=np.bool_)
+    for row in range(features.shape[0]):
+        a = features[row]
+        wrist_x = a[0]
+        wrist_y = a[1]
+        dx = a[36] - wrist_x  # x13, middle finger tip
+        dy = a[37] - wrist_y
+        scale_factor = (dx * dx + dy * dy) ** 0.5
+        if not (np.isfinite(scale_factor) and scale_factor > 0):
+            valid[row] = False
+            continue
+        for i in range(0, a.shape[0], 3):
+            a[i] = (a[i] - wrist_x) / scale_factor
+            a[i + 1] = (a[i + 1] - wrist_y) / scale_factor
+        for i in range(a.shape[0]):
+            if not np.isfinite(a[i]):
+                valid[row] = False
+                break
+    return valid
+
+
+class InvalidLandmarksError(ValueError):
+    """Raised for landmarks that can't be normalized into model input"""
+
+
+def normalize_landmarks(features):
+    """Normalize hand landmarks by recentering and scaling.
+
+    `features` is an (n, 63) array laid out as FEATURE_NAMES and is
+    normalized in place. Returns a boolean mask of the rows that could be
+    normalized; a row is invalid when its wrist and middle finger tip
+    coincide or the result is not finite.
+    """
+    valid = _normalize_rows(features)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Wrist (x1, y1) after normalization: {features[valid, :2].mean(axis=0)}")
+        logger.debug(f"Middle finger tip (x13, y13) distance from wrist: "
+                     f"{np.hypot(features[valid, 36], features[valid, 37]).mean()}")
+
+    return valid
+
+# ---------- COMPILED SVM ----------
+class SVMParams(NamedTuple):
+    """Fitted RBF SVC parameters in the layout the jitted kernels expect"""
+    support_vectors: np.ndarray  # (n_features, n_SV) float32, one row per feature
+    dual_coef: np.ndarray        # (n_classes - 1, n_SV) float32
+    intercept: np.ndarray        # (n_pairs,) float32, one-vs-one
+    prob_a: np.ndarray           # (n_pairs,) float64, Platt scaling
+    prob_b: np.ndarray           # (n_pairs,) float64
+    gamma: float
+    sv_start: np.ndarray         # (n_classes,) first SV row of each class
+    n_support: np.ndarray        # (n_classes,) SV count of each class
+
+
+def compile_svm(svc):
+    """Extract a fitted probability-enabled RBF SVC into SVMParams"""
+    if svc.kernel != "rbf" or not svc.probability:
+        raise ValueError("Only RBF SVCs fitted with probability=True are supported")
+    n_support = svc.n_support_.astype(np.int64)
+    return SVMParams(
+        support_vectors=np.ascontiguousarray(svc.support_vectors_.T, dtype=np.float32),
+        dual_coef=np.ascontiguousarray(svc.dual_coef_, dtype=np.float32),
+        intercept=np.ascontiguousarray(svc.intercept_, dtype=np.float32),
+        prob_a=np.ascontiguousarray(svc.probA_, dtype=np.float64),
+        prob_b=np.ascontiguousarray(svc.probB_, dtype=np.float64),
+        gamma=float(svc._gamma),
+        sv_start=np.concatenate(([0], np.cumsum(n_support)[:-1])).astype(np.int64),
+        n_support=n_support,
+    )
+
+
+@njit(nogil=True, fastmath=True)
+def rbf_decision(x, sv, dual_coef, intercept, gamma, sv_start, n_support):
+    """One-vs-one decision values of an RBF SVC for a single row, in libsvm pair order.
+
+    `sv` is stored feature-major so the inner loop runs over contiguous
+    support vectors and vectorizes.
+    """
+    n_features, n_sv = sv.shape
+    sq_dist = np.zeros(n_sv, dtype=np.float32)
+    for f in range(n_features):
+        xf = x[f]
+        for s in range(n_sv):
+            diff = xf - sv[f, s]
+            sq_dist[s] += diff * diff
+    kernel = np.empty(n_sv)
+    for s in range(n_sv):
+        kernel[s] = np.exp(-gamma * sq_dist[s])
+
+    n_classes = n_support.shape[0]
+    dec = np.empty(n_classes * (n_classes - 1) // 2)
+    p = 0
+    for i in range(n_classes):
+        for j in range(i + 1, n_classes):
+            total = 0.0
+            for s in range(sv_start[i], sv_start[i] + n_support[i]):
+                total += dual_coef[j - 1, s] * kernel[s]
+            for s in range(sv_start[j], sv_start[j] + n_support[j]):
+                total += dual_coef[i, s] * kernel[s]
+            dec[p] = total + intercept[p]
+            p += 1
+    return dec
+
+
+@njit(nogil=True)
+def couple_probabilities(dec, prob_a, prob_b, n_classes):
+    """Platt-scale pairwise decision values and couple them into class
+    probabilities, following libsvm's multiclass_probability"""
+    min_prob = 1e-7
+    r = np.empty((n_classes, n_classes))
+    p = 0
+    for i in range(n_classes):
+        for j in range(i + 1, n_classes):
+            f = dec[p] * prob_a[p] + prob_b[p]
+            if f >= 0:
+                prob = np.exp(-f) / (1.0 + np.exp(-f))
+            else:
+                prob = 1.0 / (1.0 + np.exp(f))
+            prob = min(max(prob, min_prob), 1 - min_prob)
+            r[i, j] = prob
+            r[j, i] = 1 - prob
+            p += 1
+
+    q = np.zeros((n_classes, n_classes))
+    for t in range(n_classes):
+        for j in range(n_classes):
+            if j != t:
+                q[t, t] += r[j, t] * r[j, t]
+                q[t, j] = -r[j, t] * r[t, j]
+
+    probs = np.full(n_classes, 1.0 / n_classes)
+    qp = np.empty(n_classes)
+    eps = 0.005 / n_classes
+    for _ in range(max(100, n_classes)):
+        pqp = 0.0
+        for t in range(n_classes):
+            qp[t] = 0.0
+            for j in range(n_classes):
+                qp[t] += q[t, j] * probs[j]
+            pqp += probs[t] * qp[t]
+        max_error = 0.0
+        for t in range(n_classes):
+            max_error = max(max_error, abs(qp[t] - pqp))
+        if max_error < eps:
+            break
+        for t in range(n_classes):
+            diff = (-qp[t] + pqp) / q[t, t]
+            probs[t] += diff
+            pqp = (pqp + diff * (diff * q[t, t] + 2 * qp[t])) / (1 + diff) / (1 + diff)
+            for j in range(n_classes):
+                qp[j] = (qp[j] + diff * q[t, j]) / (1 + diff)
+                probs[j] /= 1 + diff
+    return probs
+
+
+@njit(nogil=True)
+def svm_predict(features, sv, dual_coef, intercept, prob_a, prob_b, gamma, sv_start, n_support):
+    """Predict class indices (by one-vs-one voting, as SVC.predict does) and
+    class probabilities (as SVC.predict_proba does) for an (n, n_features) batch"""
+    n_rows = features.shape[0]
+    n_classes = n_support.shape[0]
+    predictions = np.empty(n_rows, dtype=np.int64)
+    probabilities = np.empty((n_rows, n_classes))
+    votes = np.empty(n_classes, dtype=np.int64)
+    for row in range(n_rows):
+        dec = rbf_decision(features[row], sv, dual_coef, intercept, gamma, sv_start, n_support)
+        votes[:] = 0
+        p = 0
+        for i in range(n_classes):
+            for j in range(i + 1, n_classes):
+                if dec[p] > 0:
+                    votes[i] += 1
+                else:
+                    votes[j] += 1
+                p += 1
+        predictions[row] = np.argmax(votes)
+        probabilities[row] = couple_probabilities(dec, prob_a, prob_b, n_classes)
+    return predictions, probabilities
 
-def normalize_landmarks(df):
-    """Normalize hand landmarks by recentering and scaling"""
-    wrist_x = df['x1'].values
-    wrist_y = df['y1'].values
-    middle_tip_x = df['x13'].values
-    middle_tip_y = df['y13'].values
 
-    scale_factor = np.sqrt((middle_tip_x - wrist_x)**2 + (middle_tip_y - wrist_y)**2)
+# ---------- CONFIGURE LOGGING ----------
+# Handlers only enqueue records; a background thread does the actual I/O so
+# request threads never block on stderr
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+                    handlers=[logging.handlers.QueueHandler(log_queue)])
+log_listener.start()
+atexit.register(log_listener.stop)
+logger = logging.getLogger(__name__)
 
-    for i in range(1, 22):
-        df[f'x{i}'] = (df[f'x{i}'] - wrist_x) / scale_factor
-        df[f'y{i}'] = (df[f'y{i}'] - wrist_y) / scale_factor
+# ---------- FASTAPI APP ----------
+app = FastAPI(title="Hand Gesture Recognition API", version="1.0.0",
+              default_response_class=ORJSONResponse)
 
-    print("Wrist (x1, y1) after normalization:", df[['x1', 'y1']].mean().values)
-    print("Middle finger tip (x13, y13) distance from wrist:",
-          np.sqrt(df['x13']**2 + df['y13']**2).mean())
+# ---------- REQUEST SIZE LIMITS ----------
+MAX_BATCH_ROWS = int(os.getenv("MAX_BATCH_ROWS", "256"))
 
-    return df
+# 63 full-precision floats fit comfortably in 2KB per row
+MAX_BODY_BYTES = {
+    "/predict": 2048,
+    "/predict/batch": 2048 * MAX_BATCH_ROWS,
+}
 
-# ---------- CONFIGURE LOGGING ----------
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
-# ---------- FASTAPI APP ----------
-app = FastAPI(title="Hand Gesture Recognition API", version="1.0.0")
+# Registered before CORSMiddleware so CORS wraps it and the 413/400 responses
+# still carry Access-Control-Allow-Origin for the browser frontend
+@app.middleware("http")
+async def limit_body_size(request: Request, call_next):
+    """Reject oversized bodies from their Content-Length before reading them"""
+    limit = MAX_BODY_BYTES.get(request.url.path)
+    if limit is not None:
+        try:
+            content_length = int(request.headers.get("content-length", 0))
+        except ValueError:
+            return ORJSONResponse({"detail": "Invalid Content-Length header"}, status_code=400)
+        if content_length > limit:
+            return ORJSONResponse({"detail": "Request body too large"}, status_code=413)
+    return await call_next(request)
 
 origins = [
     "http://127.0.0.1:5500",  # your frontend URL
@@ -54,6 +264,13 @@ app.add_middleware(
 )
 
 Instrumentator().instrument(app).expose(app)
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # Same body as FastAPI's default handler, but orjson writes NaN/Infinity
+    # echoed back from the rejected input as null instead of failing with a 500
+    return ORJSONResponse({"detail": jsonable_encoder(exc.errors())}, status_code=422)
+
 # ---------- GLOBAL START TIME ----------
 app_start_time = time.time()
 
@@ -62,17 +279,53 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 model_path = os.path.join(BASE_DIR, "models", "best_model_svm.pkl")
 encoder_path = os.path.join(BASE_DIR, "models", "label_encoder.pkl")
+# Precomputed compile_svm(model) arrays, regenerated with
+# joblib.dump(compile_svm(model)._asdict(), svm_params_path)
+svm_params_path = os.path.join(BASE_DIR, "models", "svm_params.joblib")
+
+
+def load_svm_params(svc):
+    """Memory-map the precomputed kernel arrays so forked workers share the
+    same read-only pages, falling back to compiling them in memory when the
+    file is missing or doesn't belong to `svc`"""
+    if os.path.exists(svm_params_path):
+        params = SVMParams(**joblib.load(svm_params_path, mmap_mode="r"))
+        # Cheap staleness check on the small arrays and the big arrays' shapes
+        if (params.support_vectors.shape == svc.support_vectors_.T.shape
+                and params.dual_coef.shape == svc.dual_coef_.shape
+                and params.gamma == float(svc._gamma)
+                and np.array_equal(params.n_support, svc.n_support_)
+                and np.array_equal(params.intercept, svc.intercept_.astype(np.float32))):
+            return params
+        logger.warning(f"{svm_params_path} doesn't match the model, compiling SVM parameters in memory")
+    else:
+        logger.warning(f"{svm_params_path} not found, compiling SVM parameters in memory")
+    return compile_svm(svc)
+
 
 try:
     with open(model_path, "rb") as f:
         model = pickle.load(f)
     with open(encoder_path, "rb") as f:
         label_encoder = pickle.load(f)
+    # Features are passed as plain arrays in FEATURE_NAMES order, so check that
+    # matches training and drop the recorded names to keep sklearn from warning
+    if hasattr(model, "feature_names_in_"):
+        if tuple(model.feature_names_in_) != FEATURE_NAMES:
+            raise ValueError("Model was trained on an unexpected feature layout")
+        del model.feature_names_in_
+    svm_params = load_svm_params(model)
+    logger.info(f"SVM kernel arrays memory-mapped: {isinstance(svm_params.support_vectors, np.memmap)}")
+    # Compile the kernels now so the first request doesn't pay for it
+    warmup = np.arange(len(FEATURE_NAMES), dtype=np.float32).reshape(1, -1)
+    normalize_landmarks(warmup)
+    svm_predict(warmup, *svm_params)
     logger.info("Model and encoder loaded successfully")
 except Exception as e:
     logger.error(f"Error loading model or encoder: {e}")
     model = None
     label_encoder = None
+    svm_params = None
 
 # ---------- GESTURE TO DIRECTION MAPPING ----------
 GESTURE_MAPPING = {
@@ -82,89 +335,298 @@ GESTURE_MAPPING = {
     'two_up_inverted': 'left',
 }
 
+# Gesture name and direction for each model class index, so predictions
+# skip the label encoder and the mapping lookup
+if model is not None:
+    CLASS_GESTURES = tuple(str(g) for g in label_encoder.inverse_transform(model.classes_))
+else:
+    CLASS_GESTURES = ()
+CLASS_DIRECTIONS = tuple(GESTURE_MAPPING.get(g) for g in CLASS_GESTURES)
+
 # ---------- DATA MODELS ----------
 class LandmarkData(BaseModel):
-    landmarks: List[float]  # 63 values: 21 landmarks * 3 coordinates
+    model_config = ConfigDict(extra='forbid')
+
+    # 63 values: 21 landmarks * 3 coordinates
+    landmarks: conlist(FiniteFloat, min_length=len(FEATURE_NAMES), max_length=len(FEATURE_NAMES))
+
+class BatchRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    landmarks: conlist(
+        conlist(FiniteFloat, min_length=len(FEATURE_NAMES), max_length=len(FEATURE_NAMES)),
+        min_length=1,
+        max_length=MAX_BATCH_ROWS,
+    )
 
 class PredictionResponse(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
     gesture: str
     direction: Optional[str]
     confidence: float
     timestamp: str
 
+# ---------- TIMESTAMPS ----------
+# (second, formatted prefix), swapped as one tuple so threads never pair a
+# second with another second's prefix
+_timestamp_cache = (None, "")
+
+
+def utc_timestamp():
+    """Current UTC time as ISO 8601 with milliseconds, e.g. 2023-01-01T12:00:00.000Z.
+
+    The date/time part is only reformatted once per second.
+    """
+    global _timestamp_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1000):03d}Z"
+
 # ---------- METRICS STORAGE ----------
-prediction_count = 0
-error_count = 0
-latency_sum = 0.0
+# Prometheus metrics are thread-safe and, with PROMETHEUS_MULTIPROC_DIR set,
+# shared across uvicorn workers
+PREDICTIONS = Counter("gesture_predictions", "Successful gesture predictions")
+PREDICTION_ERRORS = Counter("gesture_prediction_errors", "Failed gesture predictions")
+PREDICTION_LATENCY = Histogram("gesture_prediction_latency_seconds", "Gesture prediction request latency")
+
+
+def metrics_registry():
+    """Registry holding the metrics of every worker process"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+# ---------- MICRO-BATCHING ----------
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "32"))
+MAX_WAIT_MS = float(os.getenv("MAX_WAIT_MS", "2"))
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "64"))
+# Upper bound on how long /predict waits for the batch worker
+PREDICT_TIMEOUT_S = float(os.getenv("PREDICT_TIMEOUT_S", "10"))
+
+if MAX_BATCH_SIZE < 1:
+    raise ValueError(f"MAX_BATCH_SIZE must be at least 1, got {MAX_BATCH_SIZE}")
+
+prediction_queue: Optional[asyncio.Queue] = None
+batch_worker: Optional[asyncio.Task] = None
+
+# Rows are copied straight into this buffer instead of allocating an array per
+# request. Only the single batch worker touches it, one batch at a time.
+batch_buffer = np.empty((MAX_BATCH_SIZE, len(FEATURE_NAMES)), dtype=np.float32)
+
+INVALID_LANDMARKS_DETAIL = ("Landmarks can't be normalized: wrist and middle finger tip "
+                            "coincide or coordinates overflow")
+
+
+def predict_batch(features):
+    """Run the model once on an (n, 63) batch of raw landmarks.
+
+    Returns a (gesture, direction, confidence) tuple per row, or None for
+    rows whose landmarks can't be normalized or don't get a finite confidence.
+    """
+    valid = normalize_landmarks(features)
+    if not valid.all():
+        features = features[valid]
+    predictions, probabilities = svm_predict(features, *svm_params)
+    confidences = probabilities.max(axis=1)
+
+    results = [None] * len(valid)
+    for row, p, c in zip(np.flatnonzero(valid).tolist(), predictions.tolist(), confidences.tolist()):
+        # Never report a NaN confidence; the row fails like unnormalizable input
+        if math.isfinite(c):
+            results[row] = (CLASS_GESTURES[p], CLASS_DIRECTIONS[p], c)
+    return results
+
+
+async def run_batch(batch):
+    """Predict one batch of (landmarks, future) pairs and resolve the futures"""
+    futures = []
+    for landmarks, future in batch:
+        try:
+            batch_buffer[len(futures)] = landmarks
+        except (TypeError, ValueError) as e:
+            if not future.done():
+                future.set_exception(e)
+            continue
+        futures.append(future)
+    if not futures:
+        return
+
+    try:
+        results = await run_in_threadpool(predict_batch, batch_buffer[:len(futures)])
+    except Exception as e:
+        for future in futures:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for future, result in zip(futures, results):
+        # The request may have been cancelled while waiting
+        if future.done():
+            continue
+        if result is None:
+            future.set_exception(InvalidLandmarksError(INVALID_LANDMARKS_DETAIL))
+        else:
+            future.set_result(result)
+
+
+async def batch_predictions():
+    """Drain queued requests into batches of up to MAX_BATCH_SIZE rows,
+    waiting at most MAX_WAIT_MS for a batch to fill"""
+    loop = asyncio.get_running_loop()
+    max_wait = MAX_WAIT_MS / 1000
+
+    while True:
+        batch = [await prediction_queue.get()]
+        # One bad batch must not end the worker, or every later /predict hangs
+        try:
+            deadline = loop.time() + max_wait
+            while len(batch) < MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(prediction_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await run_batch(batch)
+        except Exception as e:
+            logger.exception("Batch worker failed on a batch")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def log_batch_worker_exit(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Batch worker stopped: {task.exception()}")
+
+
+@app.on_event("startup")
+async def start_batch_worker():
+    global prediction_queue, batch_worker
+    # Inference runs in the threadpool with the GIL released by the jitted
+    # kernels, so the event loop keeps serving requests meanwhile
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    prediction_queue = asyncio.Queue()
+    batch_worker = asyncio.create_task(batch_predictions())
+    batch_worker.add_done_callback(log_batch_worker_exit)
+
+
+@app.on_event("shutdown")
+async def stop_batch_worker():
+    if batch_worker is not None:
+        batch_worker.cancel()
 
 # ---------- HEALTH CHECK ----------
 @app.get("/health")
 async def health_check():
+    if batch_worker is None or batch_worker.done():
+        # /predict can't be served without the batch worker
+        return ORJSONResponse({
+            "status": "unhealthy",
+            "model_loaded": model is not None,
+            "timestamp": utc_timestamp()
+        }, status_code=503)
     return {
         "status": "healthy",
         "model_loaded": model is not None,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": utc_timestamp()
     }
 
 # ---------- PREDICTION ENDPOINT ----------
 @app.post("/predict")
-async def predict_gesture(request: Request):
-    global prediction_count, error_count, latency_sum
-
+async def predict_gesture(payload: LandmarkData):
     start_time = time.time()
 
-    # Input validation (before try-catch to avoid being caught by the generic exception handler)
     if model is None or label_encoder is None:
         raise HTTPException(status_code=500, detail="Model or encoder not loaded")
 
-    # Move input validation outside the try block to ensure it's not caught by the generic exception handler
-    try:
-        data = await request.json()
-        landmarks = data.get("landmarks")
-    except Exception as e:
-        logger.error(f"Invalid JSON input: {str(e)}")
-        raise HTTPException(status_code=400, detail="Invalid JSON input") from e
-        
-    if not landmarks or len(landmarks) != 63:
-        logger.error(f"Invalid input length: expected 63 landmarks, got {len(landmarks) if landmarks else 'none'}")
-        raise HTTPException(status_code=400, detail="Expected 63 landmark features")
-
     try:
+        future = asyncio.get_running_loop().create_future()
+        await prediction_queue.put((payload.landmarks, future))
+        gesture, direction, confidence = await asyncio.wait_for(future, PREDICT_TIMEOUT_S)
 
-        features = np.array(landmarks).reshape(1, -1)
-        feature_names = [f'{axis}{i}' for i in range(1, 22) for axis in ['x', 'y', 'z']]
-        features = pd.DataFrame(features, columns=feature_names)
-        features = normalize_landmarks(features)
-        prediction = model.predict(features)[0]
-        probabilities = model.predict_proba(features)[0]
-        confidence = float(np.max(probabilities))
-
-        gesture = label_encoder.inverse_transform([prediction])[0]
-        direction = GESTURE_MAPPING.get(gesture, None)
-
-        latency = time.time() - start_time
-        latency_sum += latency
-        prediction_count += 1
+        PREDICTION_LATENCY.observe(time.time() - start_time)
+        PREDICTIONS.inc()
 
-        logger.info(f"Prediction: {gesture} → {direction} (confidence: {confidence:.3f})")
+        logger.debug("Prediction: %s → %s (confidence: %.3f)", gesture, direction, confidence)
 
         return {
             "gesture": gesture,
             "direction": direction,
             "confidence": confidence,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": utc_timestamp()
         }
 
+    except InvalidLandmarksError as e:
+        PREDICTION_ERRORS.inc()
+        raise HTTPException(status_code=422, detail=str(e))
+    except asyncio.TimeoutError:
+        PREDICTION_ERRORS.inc()
+        logger.error(f"Prediction timed out after {PREDICT_TIMEOUT_S}s")
+        raise HTTPException(status_code=503, detail="Prediction timed out")
     except Exception as e:
-        error_count += 1
+        PREDICTION_ERRORS.inc()
         logger.error(f"Prediction error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ---------- BATCH PREDICTION ENDPOINT ----------
+@app.post("/predict/batch")
+def predict_gesture_batch(payload: BatchRequest):
+    # Sync handler: FastAPI runs it in the threadpool, off the event loop
+    start_time = time.time()
+
+    if model is None or label_encoder is None:
+        raise HTTPException(status_code=500, detail="Model or encoder not loaded")
+
+    try:
+        features = np.asarray(payload.landmarks, dtype=np.float32)
+        results = predict_batch(features)
+        invalid_rows = [row for row, result in enumerate(results) if result is None]
+        if invalid_rows:
+            raise InvalidLandmarksError(f"{INVALID_LANDMARKS_DETAIL} (rows {invalid_rows})")
+
+        PREDICTION_LATENCY.observe(time.time() - start_time)
+        PREDICTIONS.inc(len(results))
+
+        return {
+            "predictions": [
+                {"gesture": gesture, "direction": direction, "confidence": confidence}
+                for gesture, direction, confidence in results
+            ],
+            "timestamp": utc_timestamp()
+        }
+
+    # Errors count rows like PREDICTIONS does; every row of a failed batch fails
+    except InvalidLandmarksError as e:
+        PREDICTION_ERRORS.inc(len(payload.landmarks))
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        PREDICTION_ERRORS.inc(len(payload.landmarks))
+        logger.error(f"Batch prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ---------- METRICS ENDPOINT ----------
 @app.get("/app-metrics")
 async def get_metrics():
-    avg_latency = latency_sum / prediction_count if prediction_count > 0 else 0.0
+    registry = metrics_registry()
+    prediction_count = int(registry.get_sample_value("gesture_predictions_total") or 0)
+    error_count = int(registry.get_sample_value("gesture_prediction_errors_total") or 0)
+    # Latency is observed once per request, while predictions and errors count
+    # rows (a /predict/batch request adds one per row)
+    latency_sum = registry.get_sample_value("gesture_prediction_latency_seconds_sum") or 0.0
+    latency_count = registry.get_sample_value("gesture_prediction_latency_seconds_count") or 0.0
+    avg_latency = latency_sum / latency_count if latency_count > 0 else 0.0
 
     return {
         "model_metrics": {
@@ -175,7 +637,7 @@ async def get_metrics():
         },
         "data_metrics": {
             "input_validation_errors": error_count,
-            "last_prediction_time": datetime.now().isoformat()
+            "last_prediction_time": utc_timestamp()
         },
         "server_metrics": {
             "uptime": time.time() - app_start_time,
@@ -186,4 +648,12 @@ async def get_metrics():
 # ---------- RUN SERVER LOCALLY ----------
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
\ No newline at end of file
@@ -1,14 +1,17 @@
 import pytest
+import json
 import numpy as np
 import sys
 import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from fastapi.testclient import TestClient
 from sklearn.exceptions import InconsistentVersionWarning
 
 # Add app path to sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
 
+import main
 from main import app as fastapi_app
 
 # Create a test client using the FastAPI app
@@ -44,9 +47,133 @@ class TestAPI:
         """Test prediction with invalid number of landmarks"""
         landmarks = np.random.rand(50).tolist()  # Invalid input (50 instead of 63)
         response = client.post("/predict", json={"landmarks": landmarks})
-        assert response.status_code == 400, f"Expected status code 400, got {response.status_code}"
-        assert "Expected 63 landmark features" in response.json()["detail"]
+        assert response.status_code == 422, f"Expected status code 422, got {response.status_code}"
+        error = response.json()["detail"][0]
+        assert error["loc"] == ["body", "landmarks"]
+        assert error["type"] == "too_short"
     
+    def test_predict_degenerate_hand(self, client):
+        """Test that landmarks which can't be normalized are rejected, not guessed"""
+        response = client.post("/predict", json={"landmarks": [0.0] * 63})
+        assert response.status_code in [422, 500]  # Model may be unavailable in test
+        if main.model is not None:
+            assert response.status_code == 422
+            assert "can't be normalized" in response.json()["detail"]
+
+    def test_predict_non_finite_input(self, client):
+        """Test that NaN/Infinity landmarks fail validation"""
+        landmarks = np.random.rand(63).tolist()
+        landmarks[5] = float("nan")
+        response = client.post("/predict", content=json.dumps({"landmarks": landmarks}),
+                               headers={"Content-Type": "application/json"})
+        assert response.status_code == 422
+
+    def test_predict_oversized_body(self, client):
+        """Test that oversized bodies are rejected before being parsed"""
+        landmarks = np.random.rand(1000).tolist()
+        response = client.post("/predict", json={"landmarks": landmarks},
+                               headers={"Origin": "http://localhost:5500"})
+        assert response.status_code == 413
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5500"
+
+    def test_predict_concurrent_requests(self, client):
+        """Test that concurrent predictions each get their own result"""
+        if main.model is None:
+            pytest.skip("Model not available")
+        batch = np.random.rand(64, 63).astype(np.float32)
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            responses = list(executor.map(
+                lambda landmarks: client.post("/predict", json={"landmarks": landmarks}),
+                batch.tolist()))
+
+        # Rows are scored independently, so each response must match a
+        # direct prediction of its own row, confidence included
+        expected = main.predict_batch(batch.copy())
+        for response, (gesture, direction, confidence) in zip(responses, expected):
+            assert response.status_code == 200
+            data = response.json()
+            assert data["gesture"] == gesture
+            assert data["direction"] == direction
+            assert data["confidence"] == confidence
+
+    def test_batch_worker_survives_failed_batch(self, client, monkeypatch):
+        """Test that a batch failing inside the worker doesn't hang later requests"""
+        if main.model is None:
+            pytest.skip("Model not available")
+        landmarks = np.random.rand(63).tolist()
+
+        def fail(features):
+            raise RuntimeError("boom")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(main, "predict_batch", fail)
+            response = client.post("/predict", json={"landmarks": landmarks})
+            assert response.status_code == 500
+
+        assert client.post("/predict", json={"landmarks": landmarks}).status_code == 200
+        assert client.get("/health").status_code == 200
+
+    def test_predict_batch(self, client):
+        """Test batch prediction returns one result per row"""
+        landmarks = np.random.rand(5, 63).tolist()
+        response = client.post("/predict/batch", json={"landmarks": landmarks})
+
+        assert response.status_code in [200, 500]  # Model may be unavailable in test
+        if response.status_code == 200:
+            data = response.json()
+            assert len(data["predictions"]) == 5
+            assert "timestamp" in data
+            for prediction in data["predictions"]:
+                assert "gesture" in prediction
+                assert "direction" in prediction
+                assert isinstance(prediction["confidence"], float)
+
+    def test_predict_batch_invalid_row(self, client):
+        """Test batch prediction rejects rows without 63 landmarks"""
+        landmarks = [np.random.rand(63).tolist(), np.random.rand(50).tolist()]
+        response = client.post("/predict/batch", json={"landmarks": landmarks})
+        assert response.status_code == 422
+
+    def test_predict_batch_degenerate_row(self, client):
+        """Test that a degenerate row fails the batch request with 422"""
+        landmarks = [np.random.rand(63).tolist(), [0.0] * 63]
+        response = client.post("/predict/batch", json={"landmarks": landmarks})
+        assert response.status_code in [422, 500]  # Model may be unavailable in test
+        if main.model is not None:
+            assert response.status_code == 422
+            assert "rows [1]" in response.json()["detail"]
+
+    def test_metrics_count_failed_batch_rows(self, client):
+        """Test that a failed batch counts one error per row, like predictions"""
+        if main.model is None:
+            pytest.skip("Model not available")
+        before = client.get("/app-metrics").json()["model_metrics"]
+        landmarks = [np.random.rand(63).tolist(), [0.0] * 63]
+        response = client.post("/predict/batch", json={"landmarks": landmarks})
+        assert response.status_code == 422
+
+        after = client.get("/app-metrics").json()["model_metrics"]
+        assert after["error_count"] == before["error_count"] + 2
+        assert after["prediction_count"] == before["prediction_count"]
+        assert after["error_rate"] == after["error_count"] / max(after["prediction_count"], 1)
+
+    def test_compiled_svm_matches_sklearn(self):
+        """Test that the jitted SVM agrees with SVC.predict / predict_proba"""
+        if main.model is None:
+            pytest.skip("Model not available")
+        # Random hands plus hands close to the training data
+        rng = np.random.default_rng(0)
+        support_vectors = np.asarray(main.model.support_vectors_)
+        features = np.vstack([
+            rng.random((16, 63)),
+            support_vectors + rng.normal(0, 0.05, support_vectors.shape),
+        ]).astype(np.float32)
+        predictions, probabilities = main.svm_predict(features, *main.svm_params)
+
+        expected = features.astype(np.float64)
+        np.testing.assert_array_equal(main.model.classes_[predictions], main.model.predict(expected))
+        np.testing.assert_allclose(probabilities, main.model.predict_proba(expected), atol=1e-4)
+
     def test_metrics_endpoint(self, client):
         """Test metrics endpoint"""
         response = client.get("/app-metrics")